@@ -6,10 +6,17 @@ Commands describe the input the account can do to the world.
 
 """
 import time  # Check time since last activity
-from evennia.utils import inherits_from
+import logging
 from evennia import default_cmds
 from evennia import Command as BaseCommand
 from evennia.commands.default.muxcommand import MuxCommand, MuxAccountCommand
+from evennia.objects.objects import DefaultObject
+from evennia.accounts.accounts import DefaultAccount
+from typeclasses.accounts import start_render_pass
+
+_CMDLOG = logging.getLogger('commands.cmd')
+_BROADCAST_FMT = '|r(|w%s|r)|n %s%s|n'  # Broadcast command echo: (character) command args
+_CALLER_KIND = {}  # Caller class -> 'object', 'account' or None, filled on first use.
 
 
 class Command(BaseCommand):
@@ -36,12 +43,6 @@ class Command(BaseCommand):
     locks = "cmd:all()"
     help_category = "General"
 
-    def at_pre_cmd(self):
-        """
-        This hook is called before `self.parse()` on all commands.
-        """
-        pass
-
     def parse(self):
         """
         This method is called by the `cmdhandler` once the command name
@@ -79,12 +80,6 @@ class Command(BaseCommand):
         """
         self.caller.msg('Command "%s" called!' % self.cmdstring)
 
-    def at_post_cmd(self):
-        """
-        This hook is called after `self.func()`.
-        """
-        pass
-
 
 class MuxCommand(default_cmds.MuxCommand):
     """
@@ -125,6 +120,7 @@ class MuxCommand(default_cmds.MuxCommand):
         """
         This hook is called before self.parse() on all commands
         """
+        start_render_pass()  # Each command renders names with fresh permission checks.
         self.command_time = time.time()
 
     def parse(self):
@@ -158,14 +154,6 @@ class MuxCommand(default_cmds.MuxCommand):
         if self.parse_using and self.parse_using in self.args:
             self.lhs, self.rhs = self.args.split(self.parse_using, 1)  # At most, split once, into left and right parts.
 
-    def func(self):
-        """
-        This is the hook function that actually does all the work. It is called
-        by the `cmdhandler` right after `self.parser()` finishes, and so has access
-        to all the variables defined therein.
-        """
-        super(MuxCommand, self).func()
-
     def at_post_cmd(self):
         """
         This hook is called after the command has finished executing
@@ -174,16 +162,17 @@ class MuxCommand(default_cmds.MuxCommand):
         char = self.character
         account = self.account
         here = char.location if char else None
-        who = account.key if account else (char if char else '-visitor-')
         cmd = self.cmdstring if self.cmdstring != '__nomatch_command' else ''
+        raw = self.raw
         if here:
-            if char.db.settings and 'broadcast commands' in char.db.settings and \
-                            char.db.settings['broadcast commands'] is True:
+            settings = char.db.settings
+            if settings and settings.get('broadcast commands') is True:
+                message = _BROADCAST_FMT % (char.key, cmd, raw.replace('|', '||'))
                 for each in here.contents:
                     if each.has_account:
-                        if each == self or each.db.settings and 'see commands' in each.db.settings and\
-                                        each.db.settings['see commands'] is True:
-                            each.msg('|r(|w%s|r)|n %s%s|n' % (char.key, cmd, self.raw.replace('|', '||')))
+                        see = each.db.settings
+                        if each == self or (see and see.get('see commands') is True):
+                            each.msg(message)
         command_time = time.time() - self.command_time
         if account:
             account.db._command_time_total = (0 if account.db._command_time_total is None
@@ -195,7 +184,9 @@ class MuxCommand(default_cmds.MuxCommand):
                 char.traits.add('cc', 'Core Count', 'counter')
             char.traits.ct.current += command_time
             char.traits.cc.current += 1
-        print(u'{}> {}{} ({:.4f})'.format(who, cmd, self.raw, command_time))
+        if _CMDLOG.isEnabledFor(logging.DEBUG):
+            who = account.key if account else (char if char else '-visitor-')
+            _CMDLOG.debug(u'%s> %s%s (%.4f)', who, cmd, raw, command_time)
 
 
 class MuxAccountCommand(MuxCommand):
@@ -215,11 +206,21 @@ class MuxAccountCommand(MuxCommand):
         We run the parent parser as usual, then fix the result
         """
         super(MuxAccountCommand, self).parse()
-
-        if inherits_from(self.caller, "evennia.objects.objects.DefaultObject"):
+        caller_class = type(self.caller)
+        try:
+            kind = _CALLER_KIND[caller_class]
+        except KeyError:
+            if isinstance(self.caller, DefaultObject):
+                kind = 'object'
+            elif isinstance(self.caller, DefaultAccount):
+                kind = 'account'
+            else:
+                kind = None
+            _CALLER_KIND[caller_class] = kind
+        if kind == 'object':
             self.character = self.caller  # caller is an Object/Character
             self.caller = self.caller.account
-        elif inherits_from(self.caller, "evennia.accounts.accounts.DefaultAccount"):
+        elif kind == 'account':
             self.character = self.caller.get_puppet(self.session)  # caller was already an Account
         else:
             self.character = None
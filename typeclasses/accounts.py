@@ -20,8 +20,48 @@ You will also need to modify the connection screen to reflect the
 possibility to connect with a guest account. The setting file accepts
 several more options for customizing the Guest account system.
 """
+import time
+from collections import deque
 from evennia import DefaultAccount, DefaultGuest
 
+_WELCOME_BANNER = '''
+        |rN  N |y  OOO |g W   W
+        |rNN  N|y OO OO|g W   W
+        |rN N N|y O   O|g W W W
+        |rN  NN|y OO OO|g W W W
+        |r N  N|y  OOO |g  W W
+         '''  # NOW (in large friendly letters)
+_WELCOME_IMAGE = ('http://marketingland.com/wp-content/ml-loads/2014/08/google-now-fade-1920-800x450.jpg',)
+_LASTSITE_SIZE = 24  # Keep the last couple dozen login sites.
+
+
+_render_pass = 0  # Bumped by start_render_pass(); cached looker checks older than this are stale.
+
+
+def start_render_pass():
+    """
+    Starts a new render pass, expiring every cached Builders check.
+    Called by MuxCommand.at_pre_cmd, so a cached result lasts one command.
+    """
+    global _render_pass
+    _render_pass += 1
+
+
+def _looker_is_builder(obj, looker):
+    """
+    Returns whether looker passes perm(Builders) on obj's lock handler.
+    The result is cached on looker's ndb for the current render pass only.
+    """
+    ndb = getattr(looker, 'ndb', None)
+    if ndb is None:
+        return obj.locks.check_lockstring(looker, "perm(Builders)")
+    cached = ndb._is_builder
+    if cached and cached[0] == _render_pass:
+        return cached[1]
+    is_builder = obj.locks.check_lockstring(looker, "perm(Builders)")
+    ndb._is_builder = (_render_pass, is_builder)
+    return is_builder
+
 
 class Account(DefaultAccount):
     """
@@ -92,58 +132,61 @@ class Account(DefaultAccount):
      at_server_shutdown()
     """
     STYLE = '|[100'
+    _FMT_BUILDER = STYLE + '%s|w(#%s)|n'
+    _FMT_PLAIN = STYLE + '%s|n'
 
     def get_display_name(self, looker, **kwargs):
         """Displays the name of the object in a viewer-aware manner."""
-        if self.locks.check_lockstring(looker, "perm(Builders)"):
-            return "%s%s|w(#%s)|n" % (self.STYLE, self.name, self.id)
+        if _looker_is_builder(self, looker):
+            return self._FMT_BUILDER % (self.name, self.id)
         else:
-            return "%s%s|n" % (self.STYLE, self.name)
+            return self._FMT_PLAIN % self.name
 
     def at_post_login(self, session=None):
-        welcome = ('''
-        |rN  N |y  OOO |g W   W
-        |rNN  N|y OO OO|g W   W
-        |rN N N|y O   O|g W W W
-        |rN  NN|y OO OO|g W W W
-        |r N  N|y  OOO |g  W W
-         ''', 'NOW (in large friendly letters)')
         # if the account has saved protocol flags, apply them to this session.
         protocol_flags = self.attributes.get("_saved_protocol_flags", None)
         if session and protocol_flags:
             session.update_flags(**protocol_flags)
-
-        # inform the client of logged in status via OOB message
-        if session:
-            session.msg(logged_in={})
-
         self._send_to_connect_channel('|G{} connected|n'.format(self.key))
-        if not (self.is_superuser or (self.sessions.count() != 1)):
-            if not self.attributes.has('_quell'):
-                self.attributes.add('_quell', True)
-                self.locks.reset()
+        if not (self.is_superuser or self.sessions.count() != 1) and self.attributes.get('_quell') is None:
+            self.attributes.add('_quell', True)  # Quell by default on first login.
+            self.locks.reset()
         if session:
-            webclient = session.protocol_key == 'websocket'
-            text = '' if webclient else welcome[0]
-            text += ('\n|wSuccessful login. Welcome, %s!' % self.key)
-            if webclient:
-                session.msg(
-                    image=['http://marketingland.com/wp-content/ml-loads/2014/08/google-now-fade-1920-800x450.jpg'])
-            session.msg(text)
+            self._recent_sites().appendleft((session.address, int(time.time())))  # Newest first.
+            # inform the client of logged in status via OOB message, along with the welcome.
+            text = '\n|wSuccessful login. Welcome, %s!' % self.key
+            if session.protocol_key == 'websocket':
+                session.msg(image=list(_WELCOME_IMAGE))  # Image goes out ahead of the welcome text.
+                session.msg(text=text, logged_in={})
+            else:
+                session.msg(text=_WELCOME_BANNER + text, logged_in={})
             session.execute_cmd('@ic')
 
     def at_disconnect(self):
         super(Account, self).at_disconnect()
-        # sessions = self.sessions.all()
-        # session = sessions[-1]
-        # do_not_exceed = 24  # Keep the last dozen entries
-        # if not self.db.lastsite:
-        #     self.db.lastsite = []
-        # self.db.lastsite = self.db.lastsite.insert(0, (session.address, int(time.time())))
-        # if len(self.db.lastsite) > do_not_exceed:
-        #     self.db.lastsite.pop()
-        # print(session.cmd_total)
-        pass  # Write stats to db.
+        self._save_recent_sites()
+
+    def at_server_reload(self):
+        super(Account, self).at_server_reload()
+        self._save_recent_sites()  # ndb does not survive a reload.
+
+    def at_server_shutdown(self):
+        super(Account, self).at_server_shutdown()
+        self._save_recent_sites()
+
+    def _recent_sites(self):
+        """Returns the in-memory login site history, seeded from db.lastsite."""
+        sites = self.ndb._recent_sites
+        if sites is None:
+            sites = deque(list(self.db.lastsite or [])[:_LASTSITE_SIZE], maxlen=_LASTSITE_SIZE)
+            self.ndb._recent_sites = sites
+        return sites
+
+    def _save_recent_sites(self):
+        """Writes the login site history to the database in one go."""
+        sites = self.ndb._recent_sites
+        if sites is not None:
+            self.db.lastsite = list(sites)
 
 
 class Guest(DefaultGuest):
@@ -152,10 +195,12 @@ class Guest(DefaultGuest):
     characters are deleted after disconnection.
     """
     STYLE = '|[305'
+    _FMT_BUILDER = STYLE + '%s|w(#%s)|n'
+    _FMT_PLAIN = STYLE + '%s|n'
 
     def get_display_name(self, looker, **kwargs):
         """Displays the name of the object in a viewer-aware manner."""
-        if self.locks.check_lockstring(looker, "perm(Builders)"):
-            return "%s%s|w(#%s)|n" % (self.STYLE, self.name, self.id)
+        if _looker_is_builder(self, looker):
+            return self._FMT_BUILDER % (self.name, self.id)
         else:
-            return "%s%s|n" % (self.STYLE, self.name)
+            return self._FMT_PLAIN % self.name